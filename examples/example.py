@@ -1,6 +1,7 @@
 
 
 import asyncio
+import hmac
 from typing import Optional
 
 from owl_crypto_py.owl_client import OwlClient, UninitialisedClientError
@@ -149,8 +150,12 @@ async def main():
     
     print("PHASE 3: VERIFICATION")
     
-    keys_match = client_key == server_key
-    kc_match = client_kc_test == server_kc and server_kc_test == client_kc
+    # constant-time comparisons; these are secret-derived values
+    keys_match = hmac.compare_digest(client_key, server_key)
+    kc_match = (
+        hmac.compare_digest(client_kc_test, server_kc)
+        and hmac.compare_digest(server_kc_test, client_kc)
+    )
     
     print(f" Derived keys match: {' YES' if keys_match else ' NO'}")
     print(f" Key Confirmation matches: {' YES' if kc_match else ' NO'}")
@@ -1,7 +1,10 @@
 # Full Owl aPAKE example: async + sync API, all curves, key confirmation.
 
 import asyncio
-from typing import Optional
+import hmac
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 
 from owl_crypto_py import (
     OwlClient,
@@ -9,128 +12,184 @@ from owl_crypto_py import (
     OwlCommon,
     Config,
     Curves,
+    OwlError,
     ZKPVerificationFailure,
-    AuthenticationFailure,
     UserCredentials,
 )
-from owl_crypto_py.owl_client import UninitialisedClientError
 
 
-class Database:
+# curves to demo, selected by name via OWL_TEST_CURVES; FourQ is
+# opt-in — set OWL_TEST_CURVES=P256,P384,P521,FOURQ for the full matrix
+CURVES_ENV = os.environ.get("OWL_TEST_CURVES", "P256,P384,P521").split(",")
+
+# fail fast on typos — a misspelled name would otherwise just silently
+# drop the curve from the run (and an empty selection crashes the pool)
+_unknown = [name for name in CURVES_ENV if name not in Curves.__members__]
+if _unknown:
+    sys.exit(
+        f"Unknown curve name(s) in OWL_TEST_CURVES: {', '.join(repr(n) for n in _unknown)}; "
+        f"accepted names: {', '.join(Curves.__members__)}"
+    )
+
+# OWL_QUIET=1 drops all informational output (and its hex-encoding
+# allocations), leaving only the final summary — handy for timing runs
+QUIET = os.environ.get("OWL_QUIET") == "1"
+
+
+def say(*args, **kwargs):
+    if not QUIET:
+        print(*args, **kwargs)
+
+
+ALL_CURVES = [
+    (Curves.P256, "NIST P-256"),
+    (Curves.P384, "NIST P-384"),
+    (Curves.P521, "NIST P-521"),
+    (Curves.FOURQ, "FourQ"),
+]
+
+
+class _Log:
+    # buffers a flow's output so it reaches stdout in one write() instead
+    # of one per line; OWL_DEBUG prints each line immediately instead
     def __init__(self):
-        self.users: dict[str, UserCredentials] = {}
+        self.lines = []
+        self.verbose = bool(os.environ.get("OWL_DEBUG"))
 
-    def save(self, username: str, creds: UserCredentials):
-        self.users[username] = creds
+    def append(self, line: str = ""):
+        if QUIET:
+            return
+        if self.verbose:
+            print(line)
+        else:
+            self.lines.append(line)
 
-    def get(self, username: str) -> Optional[UserCredentials]:
-        return self.users.get(username)
+    def flush(self):
+        if self.lines:
+            sys.stdout.write("\n".join(self.lines) + "\n")
+            self.lines.clear()
+
+
+# one (Config, OwlServer) per curve, shared by all the demo flows so curve
+# setup only happens once per process
+_SERVERS: dict[Curves, tuple[Config, OwlServer]] = {}
+
+
+def get_server(curve: Curves) -> tuple[Config, OwlServer]:
+    if curve not in _SERVERS:
+        config = Config(curve=curve, serverId="auth.example.com")
+        _SERVERS[curve] = (config, OwlServer(config))
+    return _SERVERS[curve]
 
 
 async def full_async_flow(curve: Curves, label: str):
+    log = _Log()
+    try:
     
 
-    print(f"  {label}")
+        log.append(f"  {label}")
 
 
-    config = Config(curve=curve, serverId="auth.example.com")
-    client = OwlClient(config)
-    server = OwlServer(config)
-    db = Database()
-
-    username = "alice"
-    password = "hunter2"
-
-    #1. Registration 
-    print("\n[1] Registration")
-    reg_request = await client.register(username, password)
-    credentials = await server.register(reg_request)
-    db.save(username, credentials)
-    print(f"    User '{username}' registered.")
-
-    #  2. Login Flow 1: Client -> Server 
-    print("\n[2] Login — Client sends X1, X2, PI1, PI2")
-    auth_init_req = await client.authInit(username, password)
-
-    #  3. Login — Flow 2: Server -> Client 
-    print("[3] Login — Server responds with X3, X4, beta, proofs")
-    stored = db.get(username)
-    init_result = await server.authInit(username, auth_init_req, stored)
-    if isinstance(init_result, ZKPVerificationFailure):
-        print("    FAIL: server rejected client proofs")
-        return False
-
-    #4. Login  Flow 3: Client -> Server
-    print("[4] Login — Client sends alpha, proof, r")
-    finish_result = await client.authFinish(init_result.response)
-    if isinstance(finish_result, (ZKPVerificationFailure, UninitialisedClientError)):
-        print(f"    FAIL: {type(finish_result).__name__}")
-        return False
-
-    #5. Server verifies 
-    print("[5] Server verifies final message")
-    server_result = await server.authFinish(
-        username, finish_result.finishRequest, init_result.initial
-    )
-    if isinstance(server_result, (ZKPVerificationFailure, AuthenticationFailure)):
-        print(f"    FAIL: {type(server_result).__name__}")
-        return False
-
-    #6. Both sides verify key confirmation (constant-time)
-    print("[6] Key confirmation (constant-time)")
-    client_kc_ok = OwlCommon.verifyKeyConfirmation(
-        finish_result.kcTest, server_result.kc
-    )
-    server_kc_ok = OwlCommon.verifyKeyConfirmation(
-        server_result.kcTest, finish_result.kc
-    )
+        config, server = get_server(curve)
+        client = OwlClient(config)
+
+        username = "alice"
+        password = "hunter2"
+
+        #1. Registration
+        log.append("\n[1] Registration")
+        reg_request = await client.register(username, password)
+        # one user per flow, so the credentials just live in a local
+        # (see example.py for the multi-user database lookup)
+        stored_creds = await server.register(reg_request)
+        log.append(f"    User '{username}' registered.")
+
+        #  2. Login Flow 1: Client -> Server 
+        log.append("\n[2] Login — Client sends X1, X2, PI1, PI2")
+        auth_init_req = await client.authInit(username, password)
+
+        #  3. Login — Flow 2: Server -> Client 
+        log.append("[3] Login — Server responds with X3, X4, beta, proofs")
+        init_result = await server.authInit(username, auth_init_req, stored_creds)
+        if isinstance(init_result, ZKPVerificationFailure):
+            log.append("    FAIL: server rejected client proofs")
+            return False
+
+        #4. Login  Flow 3: Client -> Server
+        log.append("[4] Login — Client sends alpha, proof, r")
+        finish_result = await client.authFinish(init_result.response)
+        if isinstance(finish_result, OwlError):
+            log.append(f"    FAIL: {type(finish_result).__name__}")
+            return False
+
+        #5. Server verifies 
+        log.append("[5] Server verifies final message")
+        server_result = await server.authFinish(
+            username, finish_result.finishRequest, init_result.initial
+        )
+        if isinstance(server_result, OwlError):
+            log.append(f"    FAIL: {type(server_result).__name__}")
+            return False
+
+        #6. Both sides verify key confirmation (constant-time)
+        log.append("[6] Key confirmation (constant-time)")
+        client_kc_ok = OwlCommon.verifyKeyConfirmation(
+            finish_result.kcTest, server_result.kc
+        )
+        server_kc_ok = OwlCommon.verifyKeyConfirmation(
+            server_result.kcTest, finish_result.kc
+        )
 
-    keys_match = finish_result.key == server_result.key
+        keys_match = hmac.compare_digest(finish_result.key, server_result.key)
 
-    print(f"    Keys match:  {'YES' if keys_match else 'NO'}")
-    print(f"    KC verified: {'YES' if (client_kc_ok and server_kc_ok) else 'NO'}")
-    print(f"    Session key: {finish_result.key.hex()}")
+        log.append(f"    Keys match:  {'YES' if keys_match else 'NO'}")
+        log.append(f"    KC verified: {'YES' if (client_kc_ok and server_kc_ok) else 'NO'}")
+        log.append(f"    Session key: {finish_result.key.hex()}")
 
-    return keys_match and client_kc_ok and server_kc_ok
+        return keys_match and client_kc_ok and server_kc_ok
+    finally:
+        log.flush()
+
+
+def run_full_flow(curve: Curves, label: str) -> bool:
+    # sync wrapper so a full flow can run inside a worker process
+    return asyncio.run(full_async_flow(curve, label))
 
 
 #Wrong password test
 
 async def wrong_password_test():
 
-    print(f"  Wrong password test (P256)")
+    say(f"  Wrong password test (P256)")
 
-    config = Config(curve=Curves.P256, serverId="auth.example.com")
+    config, server = get_server(Curves.P256)
     client = OwlClient(config)
-    server = OwlServer(config)
-    db = Database()
 
     # Register with correct password
     reg = await client.register("bob", "correct_password")
     creds = await server.register(reg)
-    db.save("bob", creds)
-    print("\n    Registered 'bob' with correct password.")
+    say("\n    Registered 'bob' with correct password.")
 
-    # Try to login with wrong password
-    attacker = OwlClient(config)
-    init_req = await attacker.authInit("bob", "wrong_password")
-    init_result = await server.authInit("bob", init_req, db.get("bob"))
+    # Try to login with wrong password (reusing the registration client)
+    client.reset()
+    init_req = await client.authInit("bob", "wrong_password")
+    init_result = await server.authInit("bob", init_req, creds)
 
     if isinstance(init_result, ZKPVerificationFailure):
-        print("    Rejected at server authInit (ZKP failed).")
+        say("    Rejected at server authInit (ZKP failed).")
         return True
 
-    finish = await attacker.authFinish(init_result.response)
-    if isinstance(finish, (ZKPVerificationFailure, UninitialisedClientError)):
-        print("    Rejected at client authFinish.")
+    finish = await client.authFinish(init_result.response)
+    if isinstance(finish, OwlError):
+        say("    Rejected at client authFinish.")
         return True
 
     result = await server.authFinish("bob", finish.finishRequest, init_result.initial)
-    if isinstance(result, (AuthenticationFailure, ZKPVerificationFailure)):
-        print(f"    Correctly rejected: {type(result).__name__}")
+    if isinstance(result, OwlError):
+        say(f"    Correctly rejected: {type(result).__name__}")
         return True
 
-    print("    ERROR: should have been rejected!")
+    say("    ERROR: should have been rejected!")
     return False
 
 
@@ -139,38 +198,37 @@ async def wrong_password_test():
 def sync_demo():
     
 
-    print(f"  Sync API demo (P256)")
+    say(f"  Sync API demo (P256)")
 
 
-    config = Config(curve=Curves.P256, serverId="auth.example.com")
+    config, server = get_server(Curves.P256)
     client = OwlClient(config)
-    server = OwlServer(config)
 
     # Registration (sync)
     reg = client.register_sync("carol", "my_secret")
     creds = server.register_sync(reg)
-    print(f"    Registered 'carol' (sync).")
+    say(f"    Registered 'carol' (sync).")
 
     # Auth init (sync)
     init_req = client.authInit_sync("carol", "my_secret")
     init_result = server.authInit_sync("carol", init_req, creds)
-    print(f"    authInit done (sync).")
+    say(f"    authInit done (sync).")
 
     # Auth finish (sync)
     finish = client.authFinish_sync(init_result.response)
     server_result = server.authFinish_sync(
         "carol", finish.finishRequest, init_result.initial
     )
-    print(f"    authFinish done (sync).")
+    say(f"    authFinish done (sync).")
 
     # Verify
     ok = (
-        finish.key == server_result.key
+        hmac.compare_digest(finish.key, server_result.key)
         and OwlCommon.verifyKeyConfirmation(finish.kcTest, server_result.kc)
         and OwlCommon.verifyKeyConfirmation(server_result.kcTest, finish.kc)
     )
-    print(f"    Session key: {finish.key.hex()}")
-    print(f"    All OK: {'YES' if ok else 'NO'}")
+    say(f"    Session key: {finish.key.hex()}")
+    say(f"    All OK: {'YES' if ok else 'NO'}")
     return ok
 
 
@@ -178,7 +236,7 @@ def sync_demo():
 
 async def serialization_demo():
 
-    print(f"  Serialization round-trip demo")
+    say(f"  Serialization round-trip demo")
 
 
     config = Config(curve=Curves.P256, serverId="auth.example.com")
@@ -188,25 +246,29 @@ async def serialization_demo():
     reg = await client.register("dave", "pass123")
     creds = await server.register(reg)
 
-    # Serialize credentials to JSON (for database storage)
+    # JSON form, for humans and interop
     json_str = creds.to_json()
-    print(f"    Credentials JSON ({len(json_str)} bytes): {json_str[:80]}...")
+    say(f"    Credentials JSON ({len(json_str)} bytes): {json_str[:80]}...")
+
+    # compact binary form, for storage hot paths
+    blob = creds.to_bytes(config)
+    say(f"    Credentials binary ({len(blob)} bytes)")
 
-    # Deserialize back
-    restored = UserCredentials.deserialize(json_str, config)
-    print(f"    Deserialized back successfully: {type(restored).__name__}")
+    # Deserialize back from the binary form
+    restored = UserCredentials.from_bytes(blob, config)
+    say(f"    Deserialized back successfully: {type(restored).__name__}")
 
     # Use restored credentials for auth
     init_req = await client.authInit("dave", "pass123")
     init_result = await server.authInit("dave", init_req, restored)
-    assert not isinstance(init_result, ZKPVerificationFailure)
+    assert not isinstance(init_result, OwlError)
 
     finish = await client.authFinish(init_result.response)
     result = await server.authFinish("dave", finish.finishRequest, init_result.initial)
-    assert not isinstance(result, (AuthenticationFailure, ZKPVerificationFailure))
-    assert finish.key == result.key
+    assert not isinstance(result, OwlError)
+    assert hmac.compare_digest(finish.key, result.key)
 
-    print(f"    Auth with deserialized credentials: OK")
+    say(f"    Auth with deserialized credentials: OK")
 
 
 # Main 
@@ -214,14 +276,24 @@ async def serialization_demo():
 async def async_main():
     results = {}
 
-    # Test all curves
-    for curve, name in [
-        (Curves.P256, "NIST P-256"),
-        (Curves.P384, "NIST P-384"),
-        (Curves.P521, "NIST P-521"),
-        (Curves.FOURQ, "FourQ"),
-    ]:
-        results[name] = await full_async_flow(curve, f"Full flow {name}")
+    curves = [
+        (curve, name)
+        for curve, name in ALL_CURVES
+        if curve.name in CURVES_ENV
+    ]
+
+    # the flows are independent and CPU-bound, so run one per worker
+    # process instead of stalling on the slowest curve sequentially
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=len(curves)) as executor:
+        outcomes = await asyncio.gather(
+            *[
+                loop.run_in_executor(executor, run_full_flow, curve, f"Full flow {name}")
+                for curve, name in curves
+            ]
+        )
+    for (curve, name), ok in zip(curves, outcomes):
+        results[name] = ok
 
     # Wrong password
     results["Wrong password"] = await wrong_password_test()
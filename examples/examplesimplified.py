@@ -1,54 +1,56 @@
-import asyncio
-from owl_crypto_py import (OwlClient, OwlServer, Config, Curves,AuthInitRequest,AuthFinishRequest,ZKPVerificationFailure,AuthenticationFailure,)
-async def main():
+from owl_crypto_py import (OwlClient, OwlServer, Config, Curves,OwlError,)
+from owl_crypto_py.owl_client import LoginResult
+def main():
     # Setup
     config = Config(curve=Curves.P256, serverId="example.com")
-    server = OwlServer(config)  
+    server = OwlServer(config)
     # Simulated database
     db_credentials = {}
-    db_sessions = {} 
+    db_sessions = {}
     # REGISTRATION
     print("=== Registration ===")
     client = OwlClient(config)
     username = "alice"
     password = "secure_password_123"
-    
-    reg_request = await client.register(username, password)
-    credentials = await server.register(reg_request)
+
+    reg_request = client.register_sync(username, password)
+    credentials = server.register_sync(reg_request)
     db_credentials[username] = credentials
-    print(f" User registered\n") 
+    print(f" User registered\n")
     # Helper function for authentication
-    async def authenticate(user, pwd, session_key):
-        client = OwlClient(config)
-        
-        async def send_init(json_data):
-            req = AuthInitRequest.deserialize(json_data, config)
-            result = await server.authInit(user, req, db_credentials[user])
-            if isinstance(result, ZKPVerificationFailure):
-                return None
-            db_sessions[session_key] = result.initial
-            return result.response.to_json()
-        
-        async def send_finish(json_data):
-            req = AuthFinishRequest.deserialize(json_data, config)
-            result = await server.authFinish(user, req, db_sessions[session_key])
-            if isinstance(result, (ZKPVerificationFailure, AuthenticationFailure)):
-                return None
-            return "OK"
-        
-        return await client.login(user, pwd, send_init, send_finish)
+    # client and server share this process, so messages are handed over
+    # directly — no JSON round-trip (see example_full.py for serialization)
+    def authenticate(user, pwd, session_key):
+        # attempts run sequentially, so the one client is reused
+        client.reset()
+
+        init_request = client.authInit_sync(user, pwd)
+        init_result = server.authInit_sync(user, init_request, db_credentials[user])
+        if isinstance(init_result, OwlError):
+            return LoginResult(success=False, error="Server rejected client proofs")
+        db_sessions[session_key] = init_result.initial
+
+        finish_result = client.authFinish_sync(init_result.response)
+        if isinstance(finish_result, OwlError):
+            return LoginResult(success=False, error="Server proof verification failed")
+
+        server_result = server.authFinish_sync(user, finish_result.finishRequest, db_sessions[session_key])
+        if isinstance(server_result, OwlError):
+            return LoginResult(success=False, error="Server rejected authentication")
+
+        return LoginResult(success=True, key=finish_result.key)
     # LOGIN WITH CORRECT PASSWORD
     print("=== Login (correct password) ===")
-    result = await authenticate(username, password, "session_1")
-    
+    result = authenticate(username, password, "session_1")
+
     if result.success:
         print(f" Success! Key: {result.key.hex()[:32]}...\n")
     else:
-        print(f" Failed: {result.error}\n") 
+        print(f" Failed: {result.error}\n")
     # LOGIN WITH WRONG PASSWORD
     print("=== Login (wrong password) ===")
-    result = await authenticate(username, "wrong_password", "session_2")
-    
+    result = authenticate(username, "wrong_password", "session_2")
+
     if result.success:
         print(f" Success! Key: {result.key.hex()[:32]}...")
     else:
@@ -56,4 +58,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    main()
@@ -1,9 +1,10 @@
-from .owl_client import *
-from .owl_server import *
+from .owl_client import OwlClient, UninitialisedClientError
+from .owl_server import OwlServer
 from .owl_common import (
     Config,
     Curves,
     OwlCommon,
+    OwlError,
     ZKPVerificationFailure,
     AuthenticationFailure,
 )
@@ -23,6 +24,7 @@ __all__ = [
     'Config',
     'Curves',
     'OwlCommon',
+    'OwlError',
     'ZKPVerificationFailure',
     'AuthenticationFailure',
     
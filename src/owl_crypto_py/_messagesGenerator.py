@@ -55,6 +55,56 @@ def indent(text: str, tabs: int) -> str:
     return "    " * tabs + text
 
 
+# binary fast path, only emitted for UserCredentials (the one message
+# that gets stored rather than sent once)
+binary_methods = '''\
+    def to_bytes(self, cfg: Config) -> bytes:
+
+        # compact fixed-width binary form: X3 || PI3.h || PI3.r || pi || T
+        # much cheaper than the JSON/hex round-trip for storage hot paths
+        point_size, scalar_size = _BINARY_SIZES[cfg.curve]
+        return (
+            self.X3.toRawBytes()
+            + self.PI3.h.to_bytes(32, 'big')
+            + self.PI3.r.to_bytes(scalar_size, 'big')
+            + self.pi.to_bytes(scalar_size, 'big')
+            + self.T.toRawBytes()
+        )
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        cfg: Config,
+    ) -> Union['UserCredentials', DeserializationError]:
+
+        point_size, scalar_size = _BINARY_SIZES[cfg.curve]
+        if len(data) != 2 * point_size + 32 + 2 * scalar_size:
+            return DeserializationError(
+                "Failed to deserialize UserCredentials: invalid length"
+            )
+
+        view = memoryview(data)
+        X3 = parse_point(bytes(view[:point_size]).hex(), cfg.curve)
+        offset = point_size
+        h = int.from_bytes(view[offset:offset + 32], 'big')
+        offset += 32
+        r = int.from_bytes(view[offset:offset + scalar_size], 'big')
+        offset += scalar_size
+        pi = int.from_bytes(view[offset:offset + scalar_size], 'big')
+        offset += scalar_size
+        T = parse_point(bytes(view[offset:]).hex(), cfg.curve)
+
+        if X3 is not None and T is not None:
+            return cls(X3=X3, PI3=ZKP(h=h, r=r), pi=pi, T=T)
+
+        return DeserializationError(
+            "Failed to deserialize UserCredentials: invalid data"
+        )
+
+'''
+
+
 def generate_messages():
     template = '''\
 # THIS FILE IS GENERATED BY _messages_generator.py
@@ -64,7 +114,7 @@ import json
 from typing import Union, Any, Dict
 from dataclasses import dataclass
 
-from owl_common import Config, Curves, Point, ZKP
+from owl_common import Config, Curves, OwlError, Point, ZKP
 from extended_curves import FourQPoint
 
 
@@ -122,12 +172,22 @@ def parse_zkp(x: Any) -> Union[ZKP, None]:
     return None
 
 
-class DeserializationError(Exception):
+class DeserializationError(OwlError):
     def __init__(self, message: str):
         super().__init__(message)
         self.name = "DeserializationError"
 
 
+# (uncompressed point size, scalar size) in bytes per curve, used by the
+# fixed-width binary fast path; ZKP h values are raw SHA-256 so 32 bytes
+_BINARY_SIZES = {
+    Curves.P256: (65, 32),
+    Curves.P384: (97, 48),
+    Curves.P521: (133, 66),
+    Curves.FOURQ: (64, 31),
+}
+
+
 '''
 
     for cls_name, attrs in message_specs.items():
@@ -192,9 +252,13 @@ class DeserializationError(Exception):
         template += indent("return DeserializationError(\n", 2)
         template += indent(f'"Failed to deserialize {cls_name}: invalid data"\n', 3)
         template += indent(")\n", 2)
-        
+
         template += "\n"
-        
+
+        if cls_name == "UserCredentials":
+            template += binary_methods
+            template += "\n"
+
         template += indent("def serialize(self) -> Dict[str, Any]:\n", 1)
         template += indent('"""Serialize the object to a dict"""\n', 2)
         template += indent("return {\n", 2)
@@ -216,8 +280,12 @@ class DeserializationError(Exception):
         template += "\n"
         
         template += indent("def to_json(self) -> str:\n", 1)
-        template += indent('"""Serialize the object to JSON"""\n', 2)
-        template += indent("return json.dumps(self.serialize())\n", 2)
+        template += indent('"""Serialize the object to JSON (cached, messages are immutable)"""\n', 2)
+        template += indent("cached = getattr(self, '_json_cache', None)\n", 2)
+        template += indent("if cached is None:\n", 2)
+        template += indent("cached = json.dumps(self.serialize())\n", 3)
+        template += indent("self._json_cache = cached\n", 3)
+        template += indent("return cached\n", 2)
         
         template += "\n\n"
     
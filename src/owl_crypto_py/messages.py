@@ -5,7 +5,7 @@ import json
 from typing import Union, Any, Dict
 from dataclasses import dataclass
 
-from .owl_common import Config, Curves, Point, ZKP
+from .owl_common import Config, Curves, OwlError, Point, ZKP
 from .extended_curves import FourQPoint
 
 
@@ -60,12 +60,22 @@ def parse_zkp(x: Any) -> Union[ZKP, None]:
     return None
 
 
-class DeserializationError(Exception):
+class DeserializationError(OwlError):
     def __init__(self, message: str):
         super().__init__(message)
         self.name = "DeserializationError"
 
 
+# (uncompressed point size, scalar size) in bytes per curve, used by the
+# fixed-width binary fast path; ZKP h values are raw SHA-256 so 32 bytes
+_BINARY_SIZES = {
+    Curves.P256: (65, 32),
+    Curves.P384: (97, 48),
+    Curves.P521: (133, 66),
+    Curves.FOURQ: (64, 31),
+}
+
+
 @dataclass
 class RegistrationRequest:
     pi: int
@@ -105,7 +115,13 @@ class RegistrationRequest:
     
     def to_json(self) -> str:
         
-        return json.dumps(self.serialize())
+        # messages are never mutated after construction, so the JSON
+        # form is computed once and cached
+        cached = getattr(self, '_json_cache', None)
+        if cached is None:
+            cached = json.dumps(self.serialize())
+            self._json_cache = cached
+        return cached
 
 
 @dataclass
@@ -141,7 +157,51 @@ class UserCredentials:
         return DeserializationError(
             "Failed to deserialize UserCredentials: invalid data"
         )
-    
+
+    def to_bytes(self, cfg: Config) -> bytes:
+
+        # compact fixed-width binary form: X3 || PI3.h || PI3.r || pi || T
+        # much cheaper than the JSON/hex round-trip for storage hot paths
+        point_size, scalar_size = _BINARY_SIZES[cfg.curve]
+        return (
+            self.X3.toRawBytes()
+            + self.PI3.h.to_bytes(32, 'big')
+            + self.PI3.r.to_bytes(scalar_size, 'big')
+            + self.pi.to_bytes(scalar_size, 'big')
+            + self.T.toRawBytes()
+        )
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: bytes,
+        cfg: Config,
+    ) -> Union['UserCredentials', DeserializationError]:
+
+        point_size, scalar_size = _BINARY_SIZES[cfg.curve]
+        if len(data) != 2 * point_size + 32 + 2 * scalar_size:
+            return DeserializationError(
+                "Failed to deserialize UserCredentials: invalid length"
+            )
+
+        view = memoryview(data)
+        X3 = parse_point(bytes(view[:point_size]).hex(), cfg.curve)
+        offset = point_size
+        h = int.from_bytes(view[offset:offset + 32], 'big')
+        offset += 32
+        r = int.from_bytes(view[offset:offset + scalar_size], 'big')
+        offset += scalar_size
+        pi = int.from_bytes(view[offset:offset + scalar_size], 'big')
+        offset += scalar_size
+        T = parse_point(bytes(view[offset:]).hex(), cfg.curve)
+
+        if X3 is not None and T is not None:
+            return cls(X3=X3, PI3=ZKP(h=h, r=r), pi=pi, T=T)
+
+        return DeserializationError(
+            "Failed to deserialize UserCredentials: invalid data"
+        )
+
     def serialize(self) -> Dict[str, Any]:
         
         return {
@@ -153,7 +213,13 @@ class UserCredentials:
     
     def to_json(self) -> str:
         
-        return json.dumps(self.serialize())
+        # messages are never mutated after construction, so the JSON
+        # form is computed once and cached
+        cached = getattr(self, '_json_cache', None)
+        if cached is None:
+            cached = json.dumps(self.serialize())
+            self._json_cache = cached
+        return cached
 
 
 @dataclass
@@ -201,7 +267,13 @@ class AuthInitRequest:
     
     def to_json(self) -> str:
         
-        return json.dumps(self.serialize())
+        # messages are never mutated after construction, so the JSON
+        # form is computed once and cached
+        cached = getattr(self, '_json_cache', None)
+        if cached is None:
+            cached = json.dumps(self.serialize())
+            self._json_cache = cached
+        return cached
 
 
 @dataclass
@@ -284,7 +356,13 @@ class AuthInitialValues:
     
     def to_json(self) -> str:
         
-        return json.dumps(self.serialize())
+        # messages are never mutated after construction, so the JSON
+        # form is computed once and cached
+        cached = getattr(self, '_json_cache', None)
+        if cached is None:
+            cached = json.dumps(self.serialize())
+            self._json_cache = cached
+        return cached
 
 
 @dataclass
@@ -339,7 +417,13 @@ class AuthInitResponse:
     
     def to_json(self) -> str:
         
-        return json.dumps(self.serialize())
+        # messages are never mutated after construction, so the JSON
+        # form is computed once and cached
+        cached = getattr(self, '_json_cache', None)
+        if cached is None:
+            cached = json.dumps(self.serialize())
+            self._json_cache = cached
+        return cached
 
 
 @dataclass
@@ -384,4 +468,10 @@ class AuthFinishRequest:
     
     def to_json(self) -> str:
         
-        return json.dumps(self.serialize())
\ No newline at end of file
+        # messages are never mutated after construction, so the JSON
+        # form is computed once and cached
+        cached = getattr(self, '_json_cache', None)
+        if cached is None:
+            cached = json.dumps(self.serialize())
+            self._json_cache = cached
+        return cached
\ No newline at end of file
@@ -4,7 +4,7 @@ import hmac
 from typing import Optional, Union, Callable, Awaitable
 from dataclasses import dataclass
 
-from .owl_common import OwlCommon, ZKP, Point, ZKPVerificationFailure
+from .owl_common import OwlCommon, OwlError, ZKP, Point, ZKPVerificationFailure
 from .extended_curves import FourQPoint
 
 from .messages import (
@@ -28,7 +28,7 @@ class ClientInitVals:
     PI2: ZKP
 
 
-class UninitialisedClientError(Exception):
+class UninitialisedClientError(OwlError):
     def __init__(self):
         super().__init__("authInit must be run before authFinish")
         self.name = "UninitialisedClientError"
@@ -55,6 +55,10 @@ class OwlClient(OwlCommon):
         super().__init__(config, *args, **kwargs)
         self.initValues: Optional[ClientInitVals] = None
 
+    def reset(self):
+        """Clear any in-progress login state so the client can be reused."""
+        self.initValues = None
+
     async def register(
         self, username: str, password: str
     ) -> RegistrationRequest:
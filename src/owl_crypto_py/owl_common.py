@@ -1,3 +1,4 @@
+import functools
 import hashlib
 import hmac
 import secrets
@@ -192,13 +193,20 @@ class ZKP:
     r: int
 
 
-class ZKPVerificationFailure(Exception):
+class OwlError(Exception):
+    #Common base of the failure values returned by the protocol methods,
+    #so callers can discriminate success from failure with one isinstance
+    #check instead of a tuple of concrete types.
+    pass
+
+
+class ZKPVerificationFailure(OwlError):
     def __init__(self):
         super().__init__("ZKP verification failed")
         self.name = "ZKPVerificationFailure"
 
 
-class AuthenticationFailure(Exception):
+class AuthenticationFailure(OwlError):
     def __init__(self):
         super().__init__("Authentication failed")
         self.name = "AuthenticationFailure"
@@ -217,40 +225,48 @@ class Config:
     serverId: str
 
 
+@functools.lru_cache(maxsize=None)
+def _curve_context(curve: Curves):
+    #Builds the per-curve parameters (curve object, group order, generator)
+    #once per process; every Config/OwlCommon for the same curve shares
+    #them.  Points are never mutated in place, so sharing G is safe.
+    if curve == Curves.P256:
+        curve_obj = ec.SECP256R1()
+        n = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
+        Gx = 0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296
+        Gy = 0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5
+        G = Point(Gx, Gy, curve_obj)
+
+    elif curve == Curves.P384:
+        curve_obj = ec.SECP384R1()
+        n = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC7634D81F4372DDF581A0DB248B0A77AECEC196ACCC52973
+        Gx = 0xAA87CA22BE8B05378EB1C71EF320AD746E1D3B628BA79B9859F741E082542A385502F25DBF55296C3A545E3872760AB7
+        Gy = 0x3617DE4A96262C6F5D9E98BF9292DC29F8F41DBD289A147CE9DA3113B5F0B8C00A60B1CE1D7E819D7A431D7C90EA0E5F
+        G = Point(Gx, Gy, curve_obj)
+
+    elif curve == Curves.P521:
+        curve_obj = ec.SECP521R1()
+        n = 0x01FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFA51868783BF2F966B7FCC0148F709A5D03BB5C9B8899C47AEBB6FB71E91386409
+        Gx = 0x00C6858E06B70404E9CD9E3ECB662395B4429C648139053FB521F828AF606B4D3DBAA14B5E77EFE75928FE1DC127A2FFA8DE3348B3C1856A429BF97E7E31C2E5BD66
+        Gy = 0x011839296A789A3BC0045C8A5FB42C7D1BD998F54449579B446817AFBD17273E662C97EE72995EF42640C550B9013FAD0761353C7086A272C24088BE94769FD16650
+        G = Point(Gx, Gy, curve_obj)
+
+    elif curve == Curves.FOURQ:
+        curve_obj = None
+        n = FourQPoint.N
+        G = FourQPoint.generator()
+
+    else:
+        raise ValueError(f"Unsupported curve: {curve}")
+
+    return (curve_obj, n, G)
+
+
 class OwlCommon(ABC):
     def __init__(self, config: Config):
         self.config = config
-        curve = config.curve
         self.serverId = config.serverId
-        
-        if curve == Curves.P256:
-            self.curve_obj = ec.SECP256R1()
-            self.n = 0xFFFFFFFF00000000FFFFFFFFFFFFFFFFBCE6FAADA7179E84F3B9CAC2FC632551
-            Gx = 0x6B17D1F2E12C4247F8BCE6E563A440F277037D812DEB33A0F4A13945D898C296
-            Gy = 0x4FE342E2FE1A7F9B8EE7EB4A7C0F9E162BCE33576B315ECECBB6406837BF51F5
-            self.G = Point(Gx, Gy, self.curve_obj)
-            
-        elif curve == Curves.P384:
-            self.curve_obj = ec.SECP384R1()
-            self.n = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFC7634D81F4372DDF581A0DB248B0A77AECEC196ACCC52973
-            Gx = 0xAA87CA22BE8B05378EB1C71EF320AD746E1D3B628BA79B9859F741E082542A385502F25DBF55296C3A545E3872760AB7
-            Gy = 0x3617DE4A96262C6F5D9E98BF9292DC29F8F41DBD289A147CE9DA3113B5F0B8C00A60B1CE1D7E819D7A431D7C90EA0E5F
-            self.G = Point(Gx, Gy, self.curve_obj)
-            
-        elif curve == Curves.P521:
-            self.curve_obj = ec.SECP521R1()
-            self.n = 0x01FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFA51868783BF2F966B7FCC0148F709A5D03BB5C9B8899C47AEBB6FB71E91386409
-            Gx = 0x00C6858E06B70404E9CD9E3ECB662395B4429C648139053FB521F828AF606B4D3DBAA14B5E77EFE75928FE1DC127A2FFA8DE3348B3C1856A429BF97E7E31C2E5BD66
-            Gy = 0x011839296A789A3BC0045C8A5FB42C7D1BD998F54449579B446817AFBD17273E662C97EE72995EF42640C550B9013FAD0761353C7086A272C24088BE94769FD16650
-            self.G = Point(Gx, Gy, self.curve_obj)
-            
-        elif curve == Curves.FOURQ:
-            self.curve_obj = None
-            self.n = FourQPoint.N
-            self.G = FourQPoint.generator()
-            
-        else:
-            raise ValueError(f"Unsupported curve: {curve}")
+        self.curve_obj, self.n, self.G = _curve_context(config.curve)
     
     def modN(self, x: int) -> int:
         return ((x % self.n) + self.n) % self.n